@@ -1,7 +1,15 @@
 import pygame
 import sys
+import os
+import json
+import html
+import sqlite3
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 from pygame import gfxdraw
 import random
+import math
 import time
 import threading
 from copy import deepcopy
@@ -17,6 +25,11 @@ SQUARE_SIZE = BOARD_SIZE // COLS
 BOARD_OFFSET_X = 50  # Offset from left edge
 BOARD_OFFSET_Y = 80  # Offset from top edge
 SIDE_PANEL_X = BOARD_OFFSET_X + BOARD_SIZE + 20  # Start of side panel
+TARGET_FPS = 60
+IDLE_FPS = 5  # Frame rate for ambient animation when nobody is interacting
+IDLE_TIMEOUT = 10  # Seconds without input before animations are throttled
+EVENT_DRIVEN_LOOP = True  # Sleep on events instead of redrawing every frame
+ANALYSIS_EVENT = pygame.USEREVENT + 1  # Posted when Monte Carlo results change
 
 # Colors
 RED = (255, 50, 50)
@@ -30,16 +43,43 @@ GOLD = (255, 215, 0)
 GLOW_BLUE = (0, 200, 255, 100)
 PANEL_BG = (40, 40, 50)
 
+# Draw rules
+DRAW_REPETITIONS = 3  # Same position with the same side to move
+DRAW_QUIET_MOVES = 80  # Plies without a capture or a man move (40 moves each)
+MATERIAL_DRAW_MAX_KINGS = 2  # Equal kings-only material up to this many kings each is a draw
+
+# Looser adjudication for Monte Carlo rollouts only; random play rarely converts king endings
+ROLLOUT_QUIET_MOVES = 40
+ROLLOUT_ADJUDICATE_KINGS_ONLY = True  # Score kings-only positions by king count
+ROLLOUT_MAX_MOVES = 200  # Safety cap; draw rules normally end the game first
+ROLLOUT_RULES_VERSION = 2  # Bump whenever play_rollout changes how games are played out
+# Identifies the rules behind stored rollout counts; the cache discards counts made under other rules
+ROLLOUT_RULES = (f"v{ROLLOUT_RULES_VERSION} moves={ROLLOUT_MAX_MOVES} quiet={ROLLOUT_QUIET_MOVES} "
+                 f"kings={ROLLOUT_ADJUDICATE_KINGS_ONLY} repetitions={DRAW_REPETITIONS} "
+                 f"material={MATERIAL_DRAW_MAX_KINGS}")
+
+# Persistent analysis cache
+ANALYSIS_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis_cache.sqlite3")
+ANALYSIS_CACHE_MAX_ENTRIES = 100000  # Least recently updated positions are evicted beyond this
+ANALYSIS_CACHE_SATURATION = 20000  # Stored samples after which no new rollouts are run
+ANALYSIS_CACHE_EVICT_EVERY = 100  # Writes between size checks, so the cache may briefly overshoot
+ANALYSIS_TIME_PER_POSITION = 3.0  # Seconds of rollouts per position; measured throughput sets the count
+
+# Post-game analysis
+POSTGAME_TIME_BUDGET = 5.0  # Total seconds to analyse every ply of a finished game
+POSTGAME_MAX_SAMPLES = 2000  # Samples per position (stored ones included) after which it is left alone
+POSTGAME_MIN_SAMPLES = 30  # Positions with fewer samples are too noisy to flag a blunder
+POSTGAME_BATCH = 10  # Rollouts per position per round-robin turn
+BLUNDER_THRESHOLD = 0.15  # Drop in the mover's expected score that flags a blunder
+BLUNDER_CONFIDENCE = 2.0  # Standard errors the drop must clear the threshold by
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
 # Fonts
 FONT_LARGE = pygame.font.SysFont('Arial', 48, bold=True)
 FONT_MEDIUM = pygame.font.SysFont('Arial', 32)
 FONT_SMALL = pygame.font.SysFont('Arial', 22)
 FONT_TINY = pygame.font.SysFont('Arial', 18)
 
-# Set up display
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("AI CHECKERS MASTER")
-
 class Piece:
     PADDING = 15
     OUTLINE = 3
@@ -114,12 +154,96 @@ class Piece:
         copy.king = self.king
         return copy
 
+COLOR_SWAP = str.maketrans("rwRW", "wrWR")
+
+class Geometry:
+    """Board size, starting setup and rule variant, with precomputed move tables
+
+    For every square the tables hold the diagonal rays towards each edge, so
+    move generation walks short precomputed lists instead of doing bounds
+    checks and coordinate arithmetic, and its cost per move does not grow
+    with the board.
+    """
+    DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+    
+    def __init__(self, name, size, piece_rows, flying_kings=False, men_capture_backwards=False):
+        if size % 2 or piece_rows * 2 >= size:
+            raise ValueError(f"Unsupported board: size {size} with {piece_rows} rows of pieces")
+        self.name = name
+        self.rows = self.cols = size
+        self.piece_rows = piece_rows
+        self.flying_kings = flying_kings  # Kings move and capture along whole diagonals
+        self.men_capture_backwards = men_capture_backwards
+        
+        # rays[row][col] lists (row step, squares from nearest to the edge) for each direction
+        self.rays = [[tuple((dr, self._ray(row, col, dr, dc))
+                            for dr, dc in self.DIRECTIONS if self._ray(row, col, dr, dc))
+                      for col in range(size)] for row in range(size)]
+        
+        # Zobrist keys for position hashing (fixed seed so hashes match across runs)
+        zobrist_random = random.Random(0xC0FFEE)
+        self.zobrist = [[[zobrist_random.getrandbits(64) for _ in range(4)]
+                         for _ in range(size)] for _ in range(size)]
+        self.zobrist_white_turn = zobrist_random.getrandbits(64)
+
+    def _ray(self, row, col, dr, dc):
+        squares = []
+        row, col = row + dr, col + dc
+        while 0 <= row < self.rows and 0 <= col < self.cols:
+            squares.append((row, col))
+            row, col = row + dr, col + dc
+        return tuple(squares)
+
+    def square_number(self, row, col):
+        """Get the PDN number of a dark square (1 is in the corner of RED's back row)"""
+        return (self.rows - 1 - row) * (self.cols // 2) + (self.cols - 1 - col) // 2 + 1
+
+    def square_to_row_col(self, square):
+        """Get the (row, col) of a dark square from its PDN number (the inverse of square_number)"""
+        if not 1 <= square <= self.rows * self.cols // 2:
+            raise ValueError(f"No square {square} on a {self.rows}x{self.cols} board")
+        pdn_row, index = divmod(square - 1, self.cols // 2)
+        row = self.rows - 1 - pdn_row
+        col = self.cols - 1 - 2 * index
+        if (row + col) % 2 == 0:
+            col -= 1
+        return row, col
+
+    def king_row(self, color):
+        """Get the row where pieces of a color are crowned"""
+        return 0 if color == RED else self.rows - 1
+
+# English draughts is what the game plays; other variants are available to tools and rollouts
+ENGLISH = Geometry("english", 8, 3)
+INTERNATIONAL = Geometry("international", 10, 4, flying_kings=True, men_capture_backwards=True)
+VARIANTS = {geometry.name: geometry for geometry in (ENGLISH, INTERNATIONAL)}
+
 class Board:
-    def __init__(self):
+    def __init__(self, geometry=ENGLISH, setup=True):
+        self.geometry = geometry
         self.board = []
-        self.red_left = self.white_left = 12
+        self.pieces = {RED: {}, WHITE: {}}  # Pieces of each color, in insertion order
+        self.red_left = self.white_left = 0
         self.red_kings = self.white_kings = 0
-        self.create_board()
+        self.hash = 0
+        if setup:
+            self.create_board()
+
+    def _piece_hash(self, piece):
+        """Get the Zobrist key for a piece on its current square"""
+        kind = (0 if piece.color == RED else 2) + (1 if piece.king else 0)
+        return self.geometry.zobrist[piece.row][piece.col][kind]
+
+    def _add_piece(self, piece):
+        self.board[piece.row][piece.col] = piece
+        self.pieces[piece.color][piece] = None
+        self.hash ^= self._piece_hash(piece)
+        if piece.color == RED:
+            self.red_left += 1
+            self.red_kings += piece.king
+        else:
+            self.white_left += 1
+            self.white_kings += piece.king
 
     def draw_squares(self, win):
         """Draw the checkerboard pattern with enhanced visuals"""
@@ -153,18 +277,15 @@ class Board:
 
     def create_board(self):
         """Initialize the board with pieces in starting positions"""
-        for row in range(ROWS):
-            self.board.append([])
-            for col in range(COLS):
+        geometry = self.geometry
+        self.board = [[0] * geometry.cols for _ in range(geometry.rows)]
+        for row in range(geometry.rows):
+            for col in range(geometry.cols):
                 if (row + col) % 2 == 1:
-                    if row < 3:
-                        self.board[row].append(Piece(row, col, WHITE))
-                    elif row > 4:
-                        self.board[row].append(Piece(row, col, RED))
-                    else:
-                        self.board[row].append(0)
-                else:
-                    self.board[row].append(0)
+                    if row < geometry.piece_rows:
+                        self._add_piece(Piece(row, col, WHITE))
+                    elif row >= geometry.rows - geometry.piece_rows:
+                        self._add_piece(Piece(row, col, RED))
 
     def draw(self, win):
         """Draw the entire board"""
@@ -177,22 +298,22 @@ class Board:
 
     def move(self, piece, row, col):
         """Move a piece and handle king promotion"""
+        self.hash ^= self._piece_hash(piece)
         self.board[piece.row][piece.col], self.board[row][col] = self.board[row][col], self.board[piece.row][piece.col]
         piece.move(row, col)
         
         # Check for king promotion
-        if row == 0 and piece.color == RED:
-            if not piece.king:
-                piece.make_king()
+        if row == self.geometry.king_row(piece.color) and not piece.king:
+            piece.make_king()
+            if piece.color == RED:
                 self.red_kings += 1
-        elif row == ROWS - 1 and piece.color == WHITE:
-            if not piece.king:
-                piece.make_king()
+            else:
                 self.white_kings += 1
+        self.hash ^= self._piece_hash(piece)
 
     def get_piece(self, row, col):
         """Get piece at specific position"""
-        if 0 <= row < ROWS and 0 <= col < COLS:
+        if 0 <= row < self.geometry.rows and 0 <= col < self.geometry.cols:
             return self.board[row][col]
         return None
 
@@ -201,47 +322,317 @@ class Board:
         for piece in pieces:
             if piece != 0:
                 self.board[piece.row][piece.col] = 0
+                del self.pieces[piece.color][piece]
+                self.hash ^= self._piece_hash(piece)
                 if piece.color == RED:
                     self.red_left -= 1
+                    if piece.king:
+                        self.red_kings -= 1
                 else:
                     self.white_left -= 1
+                    if piece.king:
+                        self.white_kings -= 1
                     
     def copy(self):
         """Create a deep copy of the board"""
-        new_board = Board()
-        new_board.board = []
-        new_board.red_left = self.red_left
-        new_board.white_left = self.white_left
-        new_board.red_kings = self.red_kings
-        new_board.white_kings = self.white_kings
-        
-        for row in range(ROWS):
-            new_board.board.append([])
-            for col in range(COLS):
-                piece = self.board[row][col]
-                if piece != 0:
-                    new_board.board[row].append(piece.copy())
-                else:
-                    new_board.board[row].append(0)
-                    
+        new_board = Board(self.geometry, setup=False)
+        new_board.board = [[0] * self.geometry.cols for _ in range(self.geometry.rows)]
+        for color in (RED, WHITE):
+            for piece in self.pieces[color]:
+                new_board._add_piece(piece.copy())
         return new_board
         
     def get_all_pieces(self, color):
         """Get all pieces of a specific color"""
-        pieces = []
-        for row in range(ROWS):
-            for col in range(COLS):
-                piece = self.board[row][col]
-                if piece != 0 and piece.color == color:
-                    pieces.append(piece)
-        return pieces
+        return list(self.pieces[color])
+
+    def get_valid_moves(self, piece):
+        """Calculate all valid moves for a piece from the geometry's precomputed rays
+
+        Returns {(row, col): [captured pieces]}. Captures are optional and a
+        multi-jump may stop on any landing square; where several routes reach
+        the same square, the one capturing most is kept.
+        """
+        board = self.board
+        forward = -1 if piece.color == RED else 1
+        flying = piece.king and self.geometry.flying_kings
+        moves = {}
+        
+        for dr, ray in self.geometry.rays[piece.row][piece.col]:
+            if dr != forward and not piece.king:
+                continue
+            for row, col in ray:
+                if board[row][col] != 0:
+                    break
+                moves[(row, col)] = []
+                if not flying:
+                    break
+        
+        self._add_jumps(piece, piece.row, piece.col, [], moves)
+        return moves
+
+    def random_move(self, color):
+        """Pick a random movable piece of a color and a random move for it
+
+        Returns (piece, (row, col), captured pieces), or None if the side
+        cannot move. Pieces are drawn without replacement until one can move,
+        which picks the same way as shuffling the whole side but stops early.
+        """
+        untried = self.get_all_pieces(color)
+        while untried:
+            i = random.randrange(len(untried))
+            piece = untried[i]
+            moves = self.get_valid_moves(piece)
+            if moves:
+                destination, skipped = random.choice(list(moves.items()))
+                return piece, destination, skipped
+            untried[i] = untried[-1]
+            untried.pop()
+        return None
+
+    def _add_jumps(self, piece, start_row, start_col, captured, moves):
+        """Add the landing squares of captures from a square, following multi-jumps"""
+        board = self.board
+        geometry = self.geometry
+        forward = -1 if piece.color == RED else 1
+        flying = piece.king and geometry.flying_kings
+        any_direction = piece.king or geometry.men_capture_backwards
+        
+        for dr, ray in geometry.rays[start_row][start_col]:
+            if dr != forward and not any_direction:
+                continue
+            
+            # Find the piece to jump: the neighbor, or the first piece along the ray for flying kings
+            # (the moving piece's own starting square counts as empty)
+            i = 0
+            if flying:
+                while i < len(ray) and board[ray[i][0]][ray[i][1]] in (0, piece):
+                    i += 1
+            if i >= len(ray) - 1:
+                continue
+            target = board[ray[i][0]][ray[i][1]]
+            if target == 0 or target is piece or target.color == piece.color or target in captured:
+                continue
+            
+            # Land on the next square, or any empty square beyond the target for flying kings
+            chain = captured + [target]
+            for row, col in ray[i + 1:]:
+                occupant = board[row][col]
+                if occupant != 0 and occupant is not piece:
+                    break
+                if len(chain) > len(moves.get((row, col), ())):
+                    moves[(row, col)] = chain
+                # A man reaching the far row is crowned, which ends the move
+                if piece.king or row != geometry.king_row(piece.color):
+                    self._add_jumps(piece, row, col, chain, moves)
+                if not flying:
+                    break
         
     def evaluate(self):
         """Evaluate the board state (positive is good for RED, negative for WHITE)"""
         return (self.red_left - self.white_left) + (self.red_kings * 0.5 - self.white_kings * 0.5)
 
+    def position_hash(self, turn):
+        """Get the hash of the position including the side to move"""
+        return self.hash ^ self.geometry.zobrist_white_turn if turn == WHITE else self.hash
+
+    def position_key(self, turn):
+        """Encode the side to move and the dark squares as a string ('r'/'w' men, 'R'/'W' kings, '.' empty)"""
+        chars = ['r' if turn == RED else 'w']
+        for row in range(self.geometry.rows):
+            for col in range(self.geometry.cols):
+                if (row + col) % 2 == 1:
+                    piece = self.board[row][col]
+                    if piece == 0:
+                        chars.append('.')
+                    else:
+                        letter = 'r' if piece.color == RED else 'w'
+                        chars.append(letter.upper() if piece.king else letter)
+        return ''.join(chars)
+
+    def canonical_key(self, turn):
+        """Get the position key with color symmetry folded, and whether the colors were swapped
+
+        Rotating the board 180 degrees and swapping colors gives an equivalent
+        position with RED and WHITE results exchanged. Reversing the dark
+        squares in row order is exactly that rotation.
+        """
+        key = self.position_key(turn)
+        swapped = key[0].translate(COLOR_SWAP) + key[:0:-1].translate(COLOR_SWAP)
+        if swapped < key:
+            return swapped, True
+        return key, False
+
+    def is_kings_only(self):
+        """Check whether every piece left on the board is a king"""
+        return self.red_kings == self.red_left and self.white_kings == self.white_left
+
+    def is_material_draw(self, max_kings=MATERIAL_DRAW_MAX_KINGS):
+        """Check for drawn material: equal kings only, at most max_kings each (e.g. lone king vs lone king)"""
+        return (0 < self.red_left <= max_kings and self.red_left == self.white_left and
+                self.is_kings_only())
+
+    def kings_only_outcome(self):
+        """Adjudicate a kings-only position by king count for rollouts: "RED", "WHITE", "DRAW", or None if men remain"""
+        if not self.is_kings_only():
+            return None
+        if self.red_left > self.white_left:
+            return "RED"
+        if self.white_left > self.red_left:
+            return "WHITE"
+        return "DRAW"
+
+class PositionHistory:
+    """Track repeated positions and quiet moves to detect drawn games"""
+    def __init__(self):
+        self.counts = {}
+        self.quiet_moves = 0
+
+    def record(self, board, turn, reset=False):
+        """Record a position; reset after captures and man moves, which can never be undone"""
+        if reset:
+            self.counts = {}
+            self.quiet_moves = 0
+        else:
+            self.quiet_moves += 1
+        key = board.position_hash(turn)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def check_draw(self, board, turn, quiet_moves=DRAW_QUIET_MOVES):
+        """Return the reason the position is drawn, or None"""
+        if self.counts.get(board.position_hash(turn), 0) >= DRAW_REPETITIONS:
+            return "REPETITION"
+        if self.quiet_moves >= quiet_moves:
+            return "NO PROGRESS"
+        if board.is_material_draw():
+            return "INSUFFICIENT MATERIAL"
+        return None
+
+    def copy(self):
+        """Create a copy of the history"""
+        new_history = PositionHistory()
+        new_history.counts = dict(self.counts)
+        new_history.quiet_moves = self.quiet_moves
+        return new_history
+
+class AnalysisCache:
+    """Persistent Monte Carlo results keyed by canonical position
+
+    Counts accumulate across runs, so positions that recur get more precise
+    over time. SQLite in WAL mode lets several readers share the file while
+    one writer adds samples. Counts are only valid for the rollout rules that
+    produced them, so opening the cache with different rules empties it.
+    """
+    def __init__(self, path=ANALYSIS_CACHE_PATH, max_entries=ANALYSIS_CACHE_MAX_ENTRIES, rules=ROLLOUT_RULES):
+        self.path = path
+        self.max_entries = max_entries
+        self.rules = rules
+        self.writes = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("""CREATE TABLE IF NOT EXISTS positions (
+                                key TEXT PRIMARY KEY,
+                                red INTEGER NOT NULL,
+                                white INTEGER NOT NULL,
+                                draw INTEGER NOT NULL,
+                                updated REAL NOT NULL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS positions_updated ON positions (updated)")
+            
+            # Drop counts made under other rollout rules; saturated positions would otherwise keep them forever
+            row = conn.execute("SELECT value FROM metadata WHERE name = 'rollout_rules'").fetchone()
+            if row is None or row[0] != rules:
+                conn.execute("DELETE FROM positions")
+                conn.execute("INSERT OR REPLACE INTO metadata (name, value) VALUES ('rollout_rules', ?)", (rules,))
+            self._evict(conn)
+
+    def _connect(self):
+        # One short-lived connection per call keeps the cache safe to use from any thread or process
+        return sqlite3.connect(self.path, timeout=5)
+
+    def lookup(self, board, turn):
+        """Get the stored RED/WHITE/DRAW counts for a position, or None"""
+        key, swapped = board.canonical_key(turn)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT red, white, draw FROM positions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        red, white, draw = row
+        if swapped:
+            red, white = white, red
+        return {"RED": red, "WHITE": white, "DRAW": draw}
+
+    def add(self, board, turn, results):
+        """Add RED/WHITE/DRAW counts to the stored ones, evicting the oldest positions every so often"""
+        key, swapped = board.canonical_key(turn)
+        red, white, draw = results["RED"], results["WHITE"], results["DRAW"]
+        if swapped:
+            red, white = white, red
+        
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""INSERT INTO positions (key, red, white, draw, updated) VALUES (?, ?, ?, ?, ?)
+                            ON CONFLICT (key) DO UPDATE SET
+                                red = red + excluded.red,
+                                white = white + excluded.white,
+                                draw = draw + excluded.draw,
+                                updated = excluded.updated""",
+                         (key, red, white, draw, time.time()))
+            self.writes += 1
+            if self.writes % ANALYSIS_CACHE_EVICT_EVERY == 0:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        """Delete the least recently updated positions beyond max_entries"""
+        excess = conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute("""DELETE FROM positions WHERE key IN
+                            (SELECT key FROM positions ORDER BY updated LIMIT ?)""", (excess,))
+
+class AnalysisBudget:
+    """Adapt how much Monte Carlo work runs per interval to hold the target frame rate"""
+    MIN_BATCH = 1
+    MAX_BATCH = 200
+    MIN_PAUSE = 0.001  # Seconds to yield to the render loop when backing off
+    MAX_PAUSE = 0.05
+    SMOOTHING = 0.1  # Weight of the newest sample in the moving averages
+    TOLERANCE = 1.1  # Frames this much slower than the target count as late
+
+    def __init__(self, target_fps=TARGET_FPS):
+        self.target_frame_ms = 1000 / target_fps
+        self.batch_size = 10  # Simulations per interval
+        self.pause = 0.01  # Seconds to sleep after each batch
+        self.frame_ms = self.target_frame_ms
+        self.rollouts_per_sec = 0.0
+
+    @property
+    def fps(self):
+        """Achieved frames per second"""
+        return 1000 / self.frame_ms if self.frame_ms > 0 else 0.0
+
+    def record_frame(self, frame_ms):
+        """Record the duration of a rendered frame in milliseconds"""
+        self.frame_ms += self.SMOOTHING * (frame_ms - self.frame_ms)
+
+    def record_batch(self, simulations, elapsed):
+        """Record a finished batch of rollouts (wall time including the pause) and retune the budget"""
+        if elapsed > 0:
+            rate = simulations / elapsed
+            if self.rollouts_per_sec == 0:
+                self.rollouts_per_sec = rate
+            else:
+                self.rollouts_per_sec += self.SMOOTHING * (rate - self.rollouts_per_sec)
+        
+        if self.frame_ms > self.target_frame_ms * self.TOLERANCE:
+            # Frames are late: back off quickly
+            self.batch_size = max(self.MIN_BATCH, self.batch_size // 2)
+            self.pause = min(self.MAX_PAUSE, max(self.MIN_PAUSE, self.pause * 2))
+        else:
+            # Frames are on time: claim more of the spare CPU
+            self.batch_size = min(self.MAX_BATCH, self.batch_size + 1)
+            self.pause = self.pause / 2 if self.pause > self.MIN_PAUSE else 0
+
 class Game:
-    def __init__(self, win):
+    def __init__(self, win, analysis_cache=None):
         self.win = win
         self.board = Board()
         self.turn = RED
@@ -249,22 +640,37 @@ class Game:
         self.valid_moves = {}
         self.game_over = False
         self.winner = None
+        self.draw_reason = None
+        self.history = PositionHistory()
+        self.history.record(self.board, self.turn, reset=True)
+        
+        # Game record for post-game analysis: every position reached and the moves between them
+        self.positions = [(self.board.copy(), self.turn, self.history.copy())]
+        self.move_log = []
+        self.post_game_report = None
+        self.post_game_running = False
+        self.report_message = None
         self.turn_indicator_time = 0
         self.clock = pygame.time.Clock()
         self.title_glow = 0
-        self.title_glow_dir = 1
+        self.last_input_time = time.time()
         
         # Monte Carlo simulation variables
         self.monte_carlo_running = False
         self.monte_carlo_results = {"RED": 0, "WHITE": 0, "DRAW": 0}
         self.monte_carlo_total = 0
         self.monte_carlo_thread = None
+        self.analysis_cache = analysis_cache  # Optional AnalysisCache shared across games
+        self.position_id = 0  # Changes with every move so stale analysis can stop
         self.auto_monte_carlo = True  # Auto-run Monte Carlo after each move
-        self.simulation_speed = 500  # Number of simulations to run
+        self.analysis_time = ANALYSIS_TIME_PER_POSITION  # Seconds of rollouts per position
+        self.analysis_budget = AnalysisBudget()
 
-    def update(self):
-        """Update the game display"""
-        self.clock.tick(60)
+    def update(self, record_frame=True):
+        """Update the game display (record_frame=False skips telemetry for frames paced by idle waits)"""
+        self.clock.tick(TARGET_FPS)
+        if record_frame:
+            self.analysis_budget.record_frame(self.clock.get_time())
         self.draw_background()
         self.board.draw(self.win)
         self.draw_valid_moves()
@@ -277,10 +683,9 @@ class Game:
         # Fill background
         self.win.fill((30, 30, 40))
         
-        # Animate title glow
-        self.title_glow += 0.05 * self.title_glow_dir
-        if self.title_glow > 1 or self.title_glow < 0:
-            self.title_glow_dir *= -1
+        # Animate title glow (time-based so it keeps its speed at any frame rate)
+        phase = pygame.time.get_ticks() * 0.003
+        self.title_glow = abs(phase % 2 - 1)
         
         # Draw glowing title
         title_text = FONT_LARGE.render("AI CHECKERS MASTER", True, 
@@ -334,6 +739,13 @@ class Game:
                 dots = "." * (int(time.time() * 2) % 4)
                 running_text = FONT_SMALL.render(f"Simulating{dots}", True, GREEN)
                 self.win.blit(running_text, (SIDE_PANEL_X + 10, y_offset + 270))
+                
+                # Show the adaptive budget and achieved rates
+                budget = self.analysis_budget
+                budget_text = FONT_TINY.render(f"{budget.rollouts_per_sec:.0f} sims/s, batch {budget.batch_size}", True, LIGHT_GRAY)
+                fps_text = FONT_TINY.render(f"{budget.fps:.0f} FPS", True, LIGHT_GRAY)
+                self.win.blit(budget_text, (SIDE_PANEL_X + 10, y_offset + 300))
+                self.win.blit(fps_text, (SIDE_PANEL_X + 10, y_offset + 320))
         else:
             # Show waiting message
             if self.monte_carlo_running:
@@ -405,6 +817,18 @@ class Game:
         if self.game_over:
             self.display_winner()
 
+    def is_animating(self):
+        """Check whether anything on screen needs full frame rate"""
+        return self.selected is not None or self.game_over or self.monte_carlo_running
+
+    def is_idle(self):
+        """Check whether the loop can sleep between frames"""
+        return not self.is_animating() or time.time() - self.last_input_time > IDLE_TIMEOUT
+
+    def publish_results(self):
+        """Wake the event-driven main loop to show new Monte Carlo results"""
+        pygame.event.post(pygame.event.Event(ANALYSIS_EVENT))
+
     def draw_selected(self):
         """Highlight the selected piece"""
         if self.selected:
@@ -426,86 +850,7 @@ class Game:
 
     def get_valid_moves(self, piece):
         """Calculate all valid moves for a piece"""
-        moves = {}
-        left = piece.col - 1
-        right = piece.col + 1
-        row = piece.row
-
-        if piece.color == RED or piece.king:
-            moves.update(self._traverse_left(row - 1, max(row - 3, -1), -1, piece.color, left))
-            moves.update(self._traverse_right(row - 1, max(row - 3, -1), -1, piece.color, right))
-        
-        if piece.color == WHITE or piece.king:
-            moves.update(self._traverse_left(row + 1, min(row + 3, ROWS), 1, piece.color, left))
-            moves.update(self._traverse_right(row + 1, min(row + 3, ROWS), 1, piece.color, right))
-        
-        return moves
-
-    def _traverse_left(self, start, stop, step, color, left, skipped=[]):
-        moves = {}
-        last = []
-        for r in range(start, stop, step):
-            if left < 0:
-                break
-            
-            current = self.board.get_piece(r, left)
-            if current == 0:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, left)] = last + skipped
-                else:
-                    moves[(r, left)] = last
-                
-                if last:
-                    if step == -1:
-                        row = max(r - 3, -1)
-                    else:
-                        row = min(r + 3, ROWS)
-                    moves.update(self._traverse_left(r + step, row, step, color, left - 1, skipped=last))
-                    moves.update(self._traverse_right(r + step, row, step, color, left + 1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
-            
-            left -= 1
-        
-        return moves
-
-    def _traverse_right(self, start, stop, step, color, right, skipped=[]):
-        moves = {}
-        last = []
-        for r in range(start, stop, step):
-            if right >= COLS:
-                break
-            
-            current = self.board.get_piece(r, right)
-            if current == 0:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, right)] = last + skipped
-                else:
-                    moves[(r, right)] = last
-                
-                if last:
-                    if step == -1:
-                        row = max(r - 3, -1)
-                    else:
-                        row = min(r + 3, ROWS)
-                    moves.update(self._traverse_left(r + step, row, step, color, right - 1, skipped=last))
-                    moves.update(self._traverse_right(r + step, row, step, color, right + 1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
-            
-            right += 1
-        
-        return moves
+        return self.board.get_valid_moves(piece)
 
     def get_row_col_from_mouse(self, pos):
         """Convert mouse position to board row and column"""
@@ -551,21 +896,29 @@ class Game:
         """Move the selected piece to the specified position"""
         piece = self.board.get_piece(row, col)
         if self.selected and piece == 0 and (row, col) in self.valid_moves:
-            self.board.move(self.selected, row, col)
             skipped = self.valid_moves[(row, col)]
+            irreversible = bool(skipped) or not self.selected.king
+            geometry = self.board.geometry
+            start = geometry.square_number(self.selected.row, self.selected.col)
+            self.move_log.append({"player": "RED" if self.turn == RED else "WHITE",
+                                  "move": f"{start}{'x' if skipped else '-'}{geometry.square_number(row, col)}"})
+            self.board.move(self.selected, row, col)
             if skipped:
                 self.board.remove(skipped)
-            self.change_turn()
+            self.change_turn(reset_history=irreversible)
             return True
         return False
 
-    def change_turn(self):
+    def change_turn(self, reset_history=False):
         """Switch to the other player's turn"""
         if self.selected:
             self.selected.selected = False
         self.valid_moves = {}
         self.selected = None
         self.turn = WHITE if self.turn == RED else RED
+        self.history.record(self.board, self.turn, reset=reset_history)
+        self.positions.append((self.board.copy(), self.turn, self.history.copy()))
+        self.position_id += 1
         self.turn_indicator_time = pygame.time.get_ticks()
         self.check_winner()
         
@@ -576,6 +929,8 @@ class Game:
         # Auto-run Monte Carlo simulation if enabled and game is not over
         if self.auto_monte_carlo and not self.game_over:
             self.run_monte_carlo_simulation()
+        elif self.game_over:
+            self.run_post_game_analysis()
 
     def check_winner(self):
         """Check for a winner"""
@@ -597,6 +952,11 @@ class Game:
         elif not white_has_moves or self.board.white_left <= 0:
             self.game_over = True
             self.winner = "RED WINS!"
+        else:
+            self.draw_reason = self.history.check_draw(self.board, self.turn)
+            if self.draw_reason:
+                self.game_over = True
+                self.winner = "DRAW!"
 
     def display_winner(self):
         """Display winner message with animation"""
@@ -619,11 +979,85 @@ class Game:
 
             self.win.blit(text, text_rect)
             
+            # Draw the reason for a drawn game
+            if self.draw_reason:
+                reason_text = FONT_SMALL.render(self.draw_reason, True, LIGHT_GRAY)
+                reason_rect = reason_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 35))
+                self.win.blit(reason_text, reason_rect)
+            
             # Draw restart prompt
             restart_text = FONT_MEDIUM.render("Click to play again", True, WHITE)
-            restart_rect = restart_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 60))
+            restart_rect = restart_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 70))
             self.win.blit(restart_text, restart_rect)
             
+            self.draw_post_game_timeline()
+
+    def draw_post_game_timeline(self):
+        """Draw RED's expected score over the game with blunders marked"""
+        graph = pygame.Rect(100, HEIGHT//2 + 120, WIDTH - 200, 150)
+        
+        if self.post_game_report is None:
+            if self.post_game_running:
+                dots = "." * (int(time.time() * 2) % 4)
+                status = FONT_SMALL.render(f"Analyzing game{dots}", True, BLUE)
+                self.win.blit(status, status.get_rect(center=(WIDTH//2, graph.centery)))
+            return
+        
+        # Draw graph background and the 50% line
+        pygame.draw.rect(self.win, PANEL_BG, graph, border_radius=5)
+        pygame.draw.line(self.win, DARK_GRAY, (graph.left, graph.centery), (graph.right, graph.centery), 1)
+        self.win.blit(FONT_TINY.render("RED", True, RED), (graph.left + 5, graph.top + 5))
+        self.win.blit(FONT_TINY.render("WHITE", True, WHITE), (graph.left + 5, graph.bottom - 25))
+        
+        # Plot RED's expected score after every ply
+        positions = self.post_game_report["positions"]
+        step = graph.width / max(1, len(positions) - 1)
+        points = []
+        for i, position in enumerate(positions):
+            score = position["red_score"] if position["red_score"] is not None else 0.5
+            points.append((graph.left + int(i * step), graph.bottom - int(score * graph.height)))
+        if len(points) > 1:
+            pygame.draw.lines(self.win, GOLD, False, points, 2)
+        
+        # Mark blunders in the color of the player who made them
+        for move in self.post_game_report["moves"]:
+            if move["blunder"]:
+                color = RED if move["player"] == "RED" else WHITE
+                pygame.draw.circle(self.win, color, points[move["ply"]], 6)
+                pygame.draw.circle(self.win, BLACK, points[move["ply"]], 6, 1)
+        
+        # Draw summary and export hint
+        message = self.report_message or f"{len(self.post_game_report['blunders'])} blunders - press E to export report"
+        summary = FONT_TINY.render(message, True, LIGHT_GRAY)
+        self.win.blit(summary, summary.get_rect(center=(WIDTH//2, graph.bottom + 20)))
+
+    def run_post_game_analysis(self):
+        """Analyse the finished game in a separate thread, fanning positions out to a process pool"""
+        if self.post_game_running or self.post_game_report is not None:
+            return
+        
+        self.post_game_running = True
+        thread = threading.Thread(target=self._post_game_worker)
+        thread.daemon = True
+        thread.start()
+
+    def _post_game_worker(self):
+        """Worker function for post-game analysis"""
+        try:
+            self.post_game_report = analyze_game(self.positions, self.move_log, self.winner, self.analysis_cache)
+        finally:
+            self.post_game_running = False
+            self.publish_results()
+
+    def export_report(self):
+        """Write the post-game report as JSON and HTML and return their paths"""
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        base = os.path.join(REPORTS_DIR, time.strftime("game-%Y%m%d-%H%M%S"))
+        write_report_json(self.post_game_report, base + ".json")
+        write_report_html(self.post_game_report, base + ".html")
+        self.report_message = f"Saved {os.path.basename(base)}.json and .html to {REPORTS_DIR}"
+        return base + ".json", base + ".html"
+            
     def run_monte_carlo_simulation(self):
         """Run Monte Carlo simulation in a separate thread"""
         if self.monte_carlo_running:
@@ -637,189 +1071,314 @@ class Game:
     def _monte_carlo_worker(self):
         """Worker function for Monte Carlo simulation"""
         try:
-            # Reset results
-            self.monte_carlo_results = {"RED": 0, "WHITE": 0, "DRAW": 0}
-            self.monte_carlo_total = 0
-            
-            # Run simulations
-            num_simulations = self.simulation_speed
-            max_moves = 200  # Prevent infinite games
-            
-            for _ in range(num_simulations):
-                # Create a copy of the current game state
-                board_copy = self.board.copy()
-                current_turn = self.turn
-                move_count = 0
-                
-                # Play a random game until completion
-                while True:
-                    # Check for winner
-                    red_pieces = board_copy.get_all_pieces(RED)
-                    white_pieces = board_copy.get_all_pieces(WHITE)
-                    
-                    if not red_pieces:
-                        self.monte_carlo_results["WHITE"] += 1
-                        break
-                    elif not white_pieces:
-                        self.monte_carlo_results["RED"] += 1
-                        break
-                    
-                    # Check for moves
-                    valid_moves_exist = False
-                    pieces = board_copy.get_all_pieces(current_turn)
-                    random.shuffle(pieces)  # Randomize piece selection
-                    
-                    for piece in pieces:
-                        moves = self._get_valid_moves_for_simulation(board_copy, piece)
-                        if moves:
-                            valid_moves_exist = True
-                            # Choose a random move
-                            move_pos, skipped = random.choice(list(moves.items()))
-                            
-                            # Execute the move
-                            row, col = move_pos
-                            board_copy.move(piece, row, col)
-                            if skipped:
-                                board_copy.remove(skipped)
-                            break
-                    
-                    if not valid_moves_exist:
-                        # Current player has no valid moves
-                        if current_turn == RED:
-                            self.monte_carlo_results["WHITE"] += 1
-                        else:
-                            self.monte_carlo_results["RED"] += 1
-                        break
-                    
-                    # Switch turn
-                    current_turn = WHITE if current_turn == RED else RED
-                    move_count += 1
-                    
-                    # Check for draw (too many moves)
-                    if move_count >= max_moves:
-                        self.monte_carlo_results["DRAW"] += 1
-                        break
-                
-                # Update total
-                self.monte_carlo_total += 1
-                
-                # Update every 10 simulations to show progress
-                if self.monte_carlo_total % 10 == 0:
-                    time.sleep(0.01)  # Small delay to allow UI updates
+            # Start over if a move is made while analysing, until the analysis matches the board
+            while not self.game_over:
+                position_id = self.position_id
+                self._analyze_position(position_id)
+                if position_id == self.position_id:
+                    break
         finally:
             self.monte_carlo_running = False
-    
-    def _get_valid_moves_for_simulation(self, board, piece):
-        """Get valid moves for a piece in simulation (without modifying the game state)"""
-        moves = {}
-        left = piece.col - 1
-        right = piece.col + 1
-        row = piece.row
+            self.publish_results()
 
-        if piece.color == RED or piece.king:
-            moves.update(self._traverse_left_sim(board, row - 1, max(row - 3, -1), -1, piece.color, left))
-            moves.update(self._traverse_right_sim(board, row - 1, max(row - 3, -1), -1, piece.color, right))
+    def _analyze_position(self, position_id):
+        """Run rollouts from the current position until its time is up, it is saturated or it changes"""
+        # Snapshot the position so the results stay attributed to it
+        board = self.board.copy()
+        turn = self.turn
+        history = self.history.copy()
+        new_results = {"RED": 0, "WHITE": 0, "DRAW": 0}
         
-        if piece.color == WHITE or piece.king:
-            moves.update(self._traverse_left_sim(board, row + 1, min(row + 3, ROWS), 1, piece.color, left))
-            moves.update(self._traverse_right_sim(board, row + 1, min(row + 3, ROWS), 1, piece.color, right))
+        # Show stored results straight away; new samples are added on top
+        cached = self.analysis_cache.lookup(board, turn) if self.analysis_cache else None
+        self.monte_carlo_results = cached or {"RED": 0, "WHITE": 0, "DRAW": 0}
+        self.monte_carlo_total = sum(self.monte_carlo_results.values())
+        self.publish_results()
         
-        return moves
+        # Run simulations for a fixed time; how many fit is up to the budget's pacing
+        deadline = time.perf_counter() + self.analysis_time
+        budget = self.analysis_budget
+        batch_start = time.perf_counter()
+        batch_count = 0
         
-    def _traverse_left_sim(self, board, start, stop, step, color, left, skipped=[]):
-        moves = {}
-        last = []
-        for r in range(start, stop, step):
-            if left < 0:
-                break
+        while (self.position_id == position_id and self.monte_carlo_total < ANALYSIS_CACHE_SATURATION and
+               time.perf_counter() < deadline):
+            outcome = play_rollout(board, turn, history)
+            new_results[outcome] += 1
+            self.monte_carlo_results[outcome] += 1
             
-            current = board.get_piece(r, left)
-            if current == 0:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, left)] = last + skipped
-                else:
-                    moves[(r, left)] = last
-                
-                if last:
-                    if step == -1:
-                        row = max(r - 3, -1)
-                    else:
-                        row = min(r + 3, ROWS)
-                    moves.update(self._traverse_left_sim(board, r + step, row, step, color, left - 1, skipped=last))
-                    moves.update(self._traverse_right_sim(board, r + step, row, step, color, left + 1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
+            # Update total
+            self.monte_carlo_total += 1
+            batch_count += 1
             
-            left -= 1
+            # Yield to the UI after each batch; the budget sizes batches to hold the frame rate
+            if batch_count >= budget.batch_size:
+                self.publish_results()
+                time.sleep(budget.pause)
+                budget.record_batch(batch_count, time.perf_counter() - batch_start)
+                batch_start = time.perf_counter()
+                batch_count = 0
         
-        return moves
+        if self.analysis_cache and sum(new_results.values()) > 0:
+            self.analysis_cache.add(board, turn, new_results)
 
-    def _traverse_right_sim(self, board, start, stop, step, color, right, skipped=[]):
-        moves = {}
-        last = []
-        for r in range(start, stop, step):
-            if right >= COLS:
-                break
-            
-            current = board.get_piece(r, right)
-            if current == 0:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, right)] = last + skipped
-                else:
-                    moves[(r, right)] = last
-                
-                if last:
-                    if step == -1:
-                        row = max(r - 3, -1)
-                    else:
-                        row = min(r + 3, ROWS)
-                    moves.update(self._traverse_left_sim(board, r + step, row, step, color, right - 1, skipped=last))
-                    moves.update(self._traverse_right_sim(board, r + step, row, step, color, right + 1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
-            
-            right += 1
+def play_rollout(board, turn, history):
+    """Play a random game from a position and return its outcome ("RED", "WHITE" or "DRAW")"""
+    # Create a copy of the game state
+    board_copy = board.copy()
+    history = history.copy()
+    current_turn = turn
+    move_count = 0
+    
+    # Play a random game until completion
+    while True:
+        # Check for winner
+        if board_copy.red_left <= 0:
+            return "WHITE"
+        elif board_copy.white_left <= 0:
+            return "RED"
         
-        return moves
+        # Choose a random move
+        move = board_copy.random_move(current_turn)
+        if move is None:
+            # Current player has no valid moves
+            return "WHITE" if current_turn == RED else "RED"
+        
+        # Execute the move
+        piece, (row, col), skipped = move
+        irreversible = bool(skipped) or not piece.king
+        board_copy.move(piece, row, col)
+        if skipped:
+            board_copy.remove(skipped)
+        
+        # Switch turn
+        current_turn = WHITE if current_turn == RED else RED
+        move_count += 1
+        history.record(board_copy, current_turn, reset=irreversible)
+        
+        # Check for draw (repetition, no progress, material or too many moves)
+        if history.check_draw(board_copy, current_turn, ROLLOUT_QUIET_MOVES) or move_count >= ROLLOUT_MAX_MOVES:
+            return "DRAW"
+        
+        # Adjudicate king endings instead of shuffling kings until the move cap
+        if ROLLOUT_ADJUDICATE_KINGS_ONLY:
+            outcome = board_copy.kings_only_outcome()
+            if outcome:
+                return outcome
+
+def _analyze_positions(jobs, deadline):
+    """Process pool worker: run rollouts round-robin over positions until each has enough or time is up"""
+    results = {index: {"RED": 0, "WHITE": 0, "DRAW": 0} for index, _, _, _, _ in jobs}
+    active = list(jobs)
+    while active and time.time() < deadline:
+        for job in list(active):
+            index, board, turn, history, wanted = job
+            counts = results[index]
+            for _ in range(POSTGAME_BATCH):
+                counts[play_rollout(board, turn, history)] += 1
+            if sum(counts.values()) >= wanted:
+                active.remove(job)
+            if time.time() >= deadline:
+                break
+    return results
+
+def expected_score(counts, player):
+    """Get a player's expected score (wins plus half the draws) from rollout counts, or None without samples"""
+    total = counts["RED"] + counts["WHITE"] + counts["DRAW"]
+    if total == 0:
+        return None
+    return (counts[player] + 0.5 * counts["DRAW"]) / total
+
+def score_standard_error(counts, player):
+    """Get the standard error of a player's expected score from rollout counts, or None without samples"""
+    total = counts["RED"] + counts["WHITE"] + counts["DRAW"]
+    if total == 0:
+        return None
+    # Each rollout scores 1, 0.5 or 0 for the player
+    score = expected_score(counts, player)
+    variance = (counts[player] + 0.25 * counts["DRAW"]) / total - score ** 2
+    return math.sqrt(max(variance, 0) / total)
+
+GAME_RESULT_OUTCOMES = {"RED WINS!": "RED", "WHITE WINS!": "WHITE", "DRAW!": "DRAW"}
+
+def analyze_game(positions, moves, result, analysis_cache=None, time_budget=POSTGAME_TIME_BUDGET, processes=None):
+    """Estimate every position of a finished game in parallel within a time budget and flag blunders
+
+    positions holds (board, turn, history) for the start and after each of
+    the moves. A move is a blunder when it drops the mover's expected score
+    by more than BLUNDER_THRESHOLD plus BLUNDER_CONFIDENCE standard errors
+    of the drop, so sampling noise alone does not flag it. The final position is scored from the
+    game's result rather than rolled out.
+    """
+    start_time = time.time()
+    deadline = start_time + time_budget
+    
+    # Start from stored results and only roll out positions that need more samples
+    counts = []
+    jobs = []
+    final_outcome = GAME_RESULT_OUTCOMES.get(result)
+    for index, (board, turn, history) in enumerate(positions):
+        if final_outcome and index == len(positions) - 1:
+            # The game is over here, so its outcome is known for certain
+            counts.append({"RED": 0, "WHITE": 0, "DRAW": 0, final_outcome: POSTGAME_MAX_SAMPLES})
+            continue
+        cached = analysis_cache.lookup(board, turn) if analysis_cache else None
+        counts.append(cached or {"RED": 0, "WHITE": 0, "DRAW": 0})
+        wanted = POSTGAME_MAX_SAMPLES - sum(counts[index].values())
+        if wanted > 0:
+            jobs.append((index, board, turn, history, wanted))
+    
+    # Interleave positions across workers so each gets a mix of long opening and short endgame rollouts
+    processes = min(processes or os.cpu_count() or 1, len(jobs))
+    if processes > 0:
+        # Spawned workers don't inherit the UI thread's pygame state
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            futures = [executor.submit(_analyze_positions, jobs[i::processes], deadline) for i in range(processes)]
+            for future in futures:
+                for index, new_counts in future.result().items():
+                    if analysis_cache and sum(new_counts.values()) > 0:
+                        board, turn, _ = positions[index]
+                        analysis_cache.add(board, turn, new_counts)
+                    for outcome, count in new_counts.items():
+                        counts[index][outcome] += count
+    
+    report_positions = []
+    for ply, (board, turn, _) in enumerate(positions):
+        report_positions.append({"ply": ply, "turn": "RED" if turn == RED else "WHITE",
+                                 "samples": sum(counts[ply].values()), **counts[ply],
+                                 "red_score": expected_score(counts[ply], "RED")})
+    
+    report_moves = []
+    for ply, move in enumerate(moves, start=1):
+        before = expected_score(counts[ply - 1], move["player"])
+        after = expected_score(counts[ply], move["player"])
+        reliable = min(sum(counts[ply - 1].values()), sum(counts[ply].values())) >= POSTGAME_MIN_SAMPLES
+        drop = before - after if before is not None and after is not None else None
+        drop_error = None
+        if drop is not None:
+            drop_error = math.hypot(score_standard_error(counts[ply - 1], move["player"]),
+                                    score_standard_error(counts[ply], move["player"]))
+        report_moves.append({"ply": ply, "player": move["player"], "move": move["move"],
+                             "score_before": before, "score_after": after, "drop": drop, "drop_error": drop_error,
+                             "blunder": (reliable and drop is not None and
+                                         drop - BLUNDER_CONFIDENCE * drop_error > BLUNDER_THRESHOLD)})
+    
+    return {"result": result, "time_budget": time_budget, "elapsed": time.time() - start_time,
+            "blunder_threshold": BLUNDER_THRESHOLD, "blunder_confidence": BLUNDER_CONFIDENCE, "positions": report_positions, "moves": report_moves,
+            "blunders": [move["ply"] for move in report_moves if move["blunder"]]}
 
-def main():
+def write_report_json(report, path):
+    """Write a post-game report as JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+def write_report_html(report, path):
+    """Write a post-game report as a standalone HTML page with a timeline graph"""
+    width, height, margin = 800, 200, 20
+    positions = report["positions"]
+    step = (width - 2 * margin) / max(1, len(positions) - 1)
+    points = []
+    for i, position in enumerate(positions):
+        score = position["red_score"] if position["red_score"] is not None else 0.5
+        points.append((margin + i * step, margin + (1 - score) * (height - 2 * margin)))
+    
+    markers = []
+    rows = []
+    for move in report["moves"]:
+        x, y = points[move["ply"]]
+        if move["blunder"]:
+            color = "#ff3232" if move["player"] == "RED" else "#f0f0f0"
+            markers.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="5" fill="{color}" stroke="#000"/>')
+        drop = f'{move["drop"] * 100:+.1f}%' if move["drop"] is not None else "-"
+        row_class = ' class="blunder"' if move["blunder"] else ""
+        rows.append(f'<tr{row_class}><td>{move["ply"]}</td><td>{move["player"]}</td>'
+                    f'<td>{html.escape(move["move"])}</td><td>{drop}</td></tr>')
+    
+    polyline = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+    page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>AI Checkers Master - Game Report</title>
+<style>
+body {{ background: #1e1e28; color: #f0f0f0; font-family: Arial, sans-serif; margin: 2em; }}
+svg {{ background: #282832; border-radius: 5px; }}
+table {{ border-collapse: collapse; margin-top: 1em; }}
+td, th {{ padding: 4px 12px; border-bottom: 1px solid #3c3c3c; text-align: left; }}
+tr.blunder {{ background: #5a2020; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(report["result"] or "")}</h1>
+<p>{len(report["blunders"])} blunders (expected score drop over {report["blunder_threshold"] * 100:.0f}%
+by {report["blunder_confidence"]:g} standard errors),
+analysed in {report["elapsed"]:.1f}s</p>
+<svg width="{width}" height="{height}">
+<line x1="{margin}" y1="{height / 2}" x2="{width - margin}" y2="{height / 2}" stroke="#3c3c3c"/>
+<polyline points="{polyline}" fill="none" stroke="#ffd700" stroke-width="2"/>
+{"".join(markers)}
+</svg>
+<p>Graph: RED's expected score (top = RED winning, bottom = WHITE winning)</p>
+<table>
+<tr><th>Ply</th><th>Player</th><th>Move</th><th>Score change</th></tr>
+{"".join(rows)}
+</table>
+</body>
+</html>
+"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+
+def main(event_driven=EVENT_DRIVEN_LOOP):
     """Main game loop"""
-    game = Game(screen)
+    # Set up display (here rather than at import so tools can use the game logic headless)
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("AI CHECKERS MASTER")
+    
+    analysis_cache = AnalysisCache()
+    game = Game(screen, analysis_cache)
     running = True
     
     # Run initial Monte Carlo simulation
     game.run_monte_carlo_simulation()
     
+    # Mouse motion changes nothing on screen, so don't let it wake the loop
+    if event_driven:
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
+    
     while running:
-        for event in pygame.event.get():
+        idle = event_driven and game.is_idle()
+        if idle:
+            # Sleep until input or analysis results arrive, redrawing ambient animation at a low rate
+            events = [pygame.event.wait(1000 // IDLE_FPS)] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+        
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             
             if event.type == pygame.MOUSEBUTTONDOWN:
                 pos = pygame.mouse.get_pos()
+                game.last_input_time = time.time()
                 
                 if not game.game_over:
                     game.select(pos)
                 else:
                     # Restart game if clicked after game over
-                    game = Game(screen)
+                    game = Game(screen, analysis_cache)
                     # Run initial Monte Carlo simulation for new game
                     game.run_monte_carlo_simulation()
             
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_e and game.post_game_report:
+                game.last_input_time = time.time()
+                game.export_report()
+            
             if event.type == pygame.USEREVENT and game.game_over:
                 running = False
         
-        game.update()
+        game.update(record_frame=not idle)
     
     pygame.quit()
     sys.exit()
@@ -0,0 +1,305 @@
+"""Streaming PDN (Portable Draughts Notation) importer for AI Checkers.
+
+Reads game archives line by line, replays every game with the game's own
+move rules (Board.move/Board.remove) and builds an on-disk index from
+position to how often it occurred, the results of the games it occurred in
+and the moves played from it. Positions use the same canonical keys as the
+analysis cache, so color-swapped positions share one entry.
+
+Squares use standard PDN numbering: 1-32, with Black (RED here, the side
+that moves first) starting on 1-12. Results follow the PGN convention of
+scoring the first mover first: "1-0" is a RED win, "0-1" a WHITE win.
+
+Usage:
+    python pdn.py archive.pdn more.pdn --processes 4
+    python pdn.py archive.pdn --index games_index.sqlite3 --chunk-size 500
+"""
+import argparse
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import closing
+
+from checkers import Board, ENGLISH, RED, WHITE
+
+PDN_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games_index.sqlite3")
+
+RESULTS = {
+    "1-0": "RED", "2-0": "RED",
+    "0-1": "WHITE", "0-2": "WHITE",
+    "1/2-1/2": "DRAW", "1-1": "DRAW",
+    "*": None,
+}
+ENGLISH_DRAUGHTS_GAME_TYPE = "21"
+SQUARES = ENGLISH.rows * ENGLISH.cols // 2
+
+TAG_RE = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+COMMENT_RE = re.compile(r'\{[^}]*\}')
+VARIATION_RE = re.compile(r'\([^()]*\)')
+MOVE_NUMBER_RE = re.compile(r'^\d+\.+')
+MOVE_RE = re.compile(r'^\d+([-x]\d+)+$')
+
+
+class IllegalMove(Exception):
+    """A PDN move that the game's rules do not allow"""
+
+
+def square_to_row_col(square):
+    """Convert a PDN square number (1-32) to a board (row, col)"""
+    try:
+        return ENGLISH.square_to_row_col(square)
+    except ValueError as error:
+        raise IllegalMove(str(error)) from None
+
+
+def swap_move(move):
+    """Rotate a move in PDN notation 180 degrees to match a color-swapped position"""
+    return re.sub(r'\d+', lambda match: str(SQUARES + 1 - int(match.group())), move)
+
+
+def read_games(lines):
+    """Yield the raw text of each game from an iterable of PDN lines, one game at a time"""
+    game = []
+    in_movetext = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('[') and in_movetext:
+            yield ''.join(game)
+            game = []
+            in_movetext = False
+        elif stripped and not stripped.startswith('['):
+            in_movetext = True
+        game.append(line)
+    if in_movetext:
+        yield ''.join(game)
+
+
+def read_chunks(paths, chunk_size):
+    """Yield lists of raw game texts from PDN files without loading whole files"""
+    chunk = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for game in read_games(f):
+                chunk.append(game)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_game(text):
+    """Parse a game's text into its tags, its moves in PDN notation and its result token"""
+    tags = dict(TAG_RE.findall(text))
+    movetext = COMMENT_RE.sub(' ', TAG_RE.sub(' ', text))
+    # Remove nested variations from the inside out
+    while True:
+        stripped = VARIATION_RE.sub(' ', movetext)
+        if stripped == movetext:
+            break
+        movetext = stripped
+
+    moves = []
+    result = tags.get("Result")
+    for token in movetext.split():
+        token = MOVE_NUMBER_RE.sub('', token).rstrip('!?')
+        if not token or token.startswith('$'):
+            continue
+        if token in RESULTS:
+            result = token
+            break
+        if not MOVE_RE.match(token):
+            raise IllegalMove(f"Unreadable move {token!r}")
+        moves.append(token)
+    return tags, moves, result
+
+
+def play_move(board, turn, move):
+    """Play a PDN move on the board, hop by hop, using the game's move generator
+
+    A move listing more than two squares is a multi-jump: every hop must
+    capture exactly the piece it jumps over, and the move ends when the piece
+    is crowned. A two-square capture such as 9x25 takes the longest route.
+    """
+    squares = [int(square) for square in re.split(r'[-x]', move)]
+    piece = board.get_piece(*square_to_row_col(squares[0]))
+    if not piece or piece.color != turn:
+        raise IllegalMove(f"No piece to move for {move}")
+    multi_jump = len(squares) > 2
+    crowned = False
+    for square in squares[1:]:
+        if crowned:
+            raise IllegalMove(f"Jump continues after crowning in {move}")
+        destination = square_to_row_col(square)
+        moves = board.get_valid_moves(piece)
+        if destination not in moves:
+            raise IllegalMove(f"Illegal move {move}")
+        skipped = moves[destination]
+        if multi_jump:
+            # The stored chain is the longest route to the square; a listed hop takes only the piece it jumps
+            row, col = destination
+            if abs(row - piece.row) != 2 or abs(col - piece.col) != 2:
+                raise IllegalMove(f"Illegal move {move}")
+            jumped = board.get_piece((piece.row + row) // 2, (piece.col + col) // 2)
+            if not jumped or jumped.color == piece.color:
+                raise IllegalMove(f"Illegal move {move}")
+            skipped = [jumped]
+        was_king = piece.king
+        board.move(piece, *destination)
+        crowned = piece.king and not was_king
+        if skipped:
+            board.remove(skipped)
+
+
+def replay_game(moves):
+    """Replay a game and list (position key, swapped, move played) for every position in it"""
+    board = Board()
+    turn = RED
+    positions = []
+    for move in moves:
+        key, swapped = board.canonical_key(turn)
+        positions.append((key, swapped, move))
+        play_move(board, turn, move)
+        turn = WHITE if turn == RED else RED
+    key, swapped = board.canonical_key(turn)
+    positions.append((key, swapped, None))
+    return positions
+
+
+def index_chunk(games):
+    """Process pool worker: replay a chunk of games and return its position statistics"""
+    positions = {}  # key -> [occurrences, RED wins, WHITE wins, draws]
+    next_moves = Counter()  # (key, move) -> count
+    imported = skipped = 0
+
+    for text in games:
+        try:
+            tags, moves, result = parse_game(text)
+            if tags.get("GameType", ENGLISH_DRAUGHTS_GAME_TYPE).split(',')[0] != ENGLISH_DRAUGHTS_GAME_TYPE:
+                raise IllegalMove("Not an English draughts game")
+            if "FEN" in tags:
+                raise IllegalMove("Setup positions are not supported")
+            outcome = RESULTS.get(result)
+            game_positions = replay_game(moves)
+        except IllegalMove:
+            skipped += 1
+            continue
+
+        imported += 1
+        for key, swapped, move in game_positions:
+            stats = positions.setdefault(key, [0, 0, 0, 0])
+            stats[0] += 1
+            if outcome == "DRAW":
+                stats[3] += 1
+            elif outcome:
+                # Swapped keys describe the position from the other side
+                red_won = (outcome == "RED") != swapped
+                stats[1 if red_won else 2] += 1
+            if move:
+                next_moves[(key, swap_move(move) if swapped else move)] += 1
+
+    return positions, next_moves, imported, skipped
+
+
+class PositionIndex:
+    """On-disk index from canonical position to frequency, results and next-move counts"""
+    def __init__(self, path=PDN_INDEX_PATH):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS positions (
+                                key TEXT PRIMARY KEY,
+                                occurrences INTEGER NOT NULL,
+                                red INTEGER NOT NULL,
+                                white INTEGER NOT NULL,
+                                draw INTEGER NOT NULL)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS next_moves (
+                                key TEXT NOT NULL,
+                                move TEXT NOT NULL,
+                                count INTEGER NOT NULL,
+                                PRIMARY KEY (key, move))""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def merge(self, positions, next_moves):
+        """Add a chunk's statistics to the index"""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("""INSERT INTO positions (key, occurrences, red, white, draw) VALUES (?, ?, ?, ?, ?)
+                                ON CONFLICT (key) DO UPDATE SET
+                                    occurrences = occurrences + excluded.occurrences,
+                                    red = red + excluded.red,
+                                    white = white + excluded.white,
+                                    draw = draw + excluded.draw""",
+                             ((key, *stats) for key, stats in positions.items()))
+            conn.executemany("""INSERT INTO next_moves (key, move, count) VALUES (?, ?, ?)
+                                ON CONFLICT (key, move) DO UPDATE SET count = count + excluded.count""",
+                             ((key, move, count) for (key, move), count in next_moves.items()))
+
+    def lookup(self, board, turn):
+        """Get how often a position occurred, its RED/WHITE/DRAW results and next-move counts, or None"""
+        key, swapped = board.canonical_key(turn)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT occurrences, red, white, draw FROM positions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            moves = conn.execute("SELECT move, count FROM next_moves WHERE key = ?", (key,)).fetchall()
+        occurrences, red, white, draw = row
+        if swapped:
+            red, white = white, red
+            moves = [(swap_move(move), count) for move, count in moves]
+        return {"occurrences": occurrences, "RED": red, "WHITE": white, "DRAW": draw, "moves": dict(moves)}
+
+
+def import_archives(paths, index, processes=1, chunk_size=500):
+    """Import PDN archives into the index, replaying chunks of games across a process pool"""
+    imported = skipped = 0
+
+    def merge(result):
+        nonlocal imported, skipped
+        positions, next_moves, chunk_imported, chunk_skipped = result
+        index.merge(positions, next_moves)
+        imported += chunk_imported
+        skipped += chunk_skipped
+
+    chunks = read_chunks(paths, chunk_size)
+    if processes <= 1:
+        for chunk in chunks:
+            merge(index_chunk(chunk))
+        return imported, skipped
+
+    # Keep only a few chunks in flight so memory stays bounded for any archive size
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(index_chunk, chunk))
+            if len(pending) >= processes * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(future.result())
+        for future in pending:
+            merge(future.result())
+    return imported, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import PDN game archives into a position-frequency index")
+    parser.add_argument("paths", nargs="+", help="PDN files to import")
+    parser.add_argument("--index", default=PDN_INDEX_PATH, help="index database to create or extend")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=500, help="games per work unit")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    imported, skipped = import_archives(args.paths, PositionIndex(args.index), args.processes, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"Imported {imported} games, skipped {skipped}")
+    print(f"{elapsed:.2f}s, {imported / max(elapsed, 1e-9):,.0f} games/sec")
+
+
+if __name__ == "__main__":
+    main()
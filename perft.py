@@ -0,0 +1,239 @@
+"""Perft move-generation verifier and speed benchmark for AI Checkers.
+
+Counts the leaf nodes of the move tree to a fixed depth from a position,
+using the move generator shared by the game and the Monte Carlo rollouts
+(Board.get_valid_moves). A standard-rules mode (captures mandatory, every
+multi-jump played to the end) builds on the same board and is checked
+against the published English draughts counts.
+
+Usage:
+    python perft.py 6                    # count leaves to depth 6
+    python perft.py 6 --divide           # per-root-move counts
+    python perft.py 8 --processes 4      # split root moves across processes
+    python perft.py 5 --variant international
+    python perft.py 6 --standard         # count with the standard English rules
+    python perft.py --verify             # check against the reference counts
+    python perft.py --bench              # random-playout plies/sec for every variant
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from checkers import Board, ENGLISH, Geometry, RED, VARIANTS, WHITE
+
+# Published leaf counts from the English draughts start position with RED
+# (Black) to move, under the standard rules: captures are mandatory and a
+# multi-jump continues until no capture is left.
+REFERENCE_COUNTS = {
+    1: 7,
+    2: 49,
+    3: 302,
+    4: 1469,
+    5: 7361,
+    6: 36768,
+    7: 179740,
+}
+
+# Leaf counts under this game's own rules, where captures are optional and a
+# multi-jump may stop on any landing square. These are not published; they
+# guard the game's move generator against unintended changes.
+HOUSE_RULE_COUNTS = {
+    1: 7,
+    2: 49,
+    3: 379,
+    4: 2872,
+    5: 23582,
+    6: 190647,
+    7: 1607272,
+}
+
+def generate_moves(board, turn, standard=False):
+    """List all moves for a side as (from, to, skipped squares) tuples"""
+    if standard:
+        return generate_standard_moves(board, turn)
+    moves = []
+    for piece in board.get_all_pieces(turn):
+        start = (piece.row, piece.col)
+        for end, skipped in board.get_valid_moves(piece).items():
+            moves.append((start, end, [(p.row, p.col) for p in skipped]))
+    return moves
+
+
+def generate_standard_moves(board, turn):
+    """List all moves for a side under the standard rules: captures are
+    mandatory and a multi-jump continues until no capture is left"""
+    geometry = board.geometry
+    if geometry.flying_kings:
+        raise ValueError(f"Standard rules are not implemented for {geometry.name}")
+    jumps = []
+    for piece in board.get_all_pieces(turn):
+        _add_standard_jumps(board, piece, piece.row, piece.col, [], jumps)
+    if jumps:
+        return jumps
+    return [move for move in generate_moves(board, turn) if not move[2]]
+
+
+def _add_standard_jumps(board, piece, row, col, captured, jumps):
+    """Follow every capture sequence from a square, adding only those that cannot continue"""
+    geometry = board.geometry
+    forward = -1 if piece.color == RED else 1
+    any_direction = piece.king or geometry.men_capture_backwards
+    extended = False
+    for dr, ray in geometry.rays[row][col]:
+        if (dr != forward and not any_direction) or len(ray) < 2:
+            continue
+        target = board.get_piece(*ray[0])
+        landing = board.get_piece(*ray[1])
+        if target == 0 or target.color == piece.color or ray[0] in captured:
+            continue
+        # Captured pieces stay on the board until the move ends; the mover's own square counts as empty
+        if landing != 0 and landing is not piece:
+            continue
+        extended = True
+        chain = captured + [ray[0]]
+        if not piece.king and ray[1][0] == geometry.king_row(piece.color):
+            # A man reaching the far row is crowned, which ends the move
+            jumps.append(((piece.row, piece.col), ray[1], chain))
+        else:
+            _add_standard_jumps(board, piece, *ray[1], chain, jumps)
+    if captured and not extended:
+        jumps.append(((piece.row, piece.col), (row, col), captured))
+
+
+def make_move(board, move):
+    """Return a copy of the board with the move played"""
+    (row, col), (end_row, end_col), skipped = move
+    new_board = board.copy()
+    new_board.move(new_board.get_piece(row, col), end_row, end_col)
+    if skipped:
+        new_board.remove([new_board.get_piece(r, c) for r, c in skipped])
+    return new_board
+
+
+def perft(board, turn, depth, standard=False):
+    """Count leaf nodes to the given depth, bulk-counting at the last ply"""
+    if depth == 0:
+        return 1
+    if depth == 1:
+        if standard:
+            return len(generate_standard_moves(board, turn))
+        return sum(len(board.get_valid_moves(piece)) for piece in board.get_all_pieces(turn))
+
+    next_turn = WHITE if turn == RED else RED
+    nodes = 0
+    for move in generate_moves(board, turn, standard):
+        nodes += perft(make_move(board, move), next_turn, depth - 1, standard)
+    return nodes
+
+
+def _perft_root_move(args):
+    """Process pool worker: count the leaves below one root move"""
+    board, turn, move, depth, standard = args
+    next_turn = WHITE if turn == RED else RED
+    return perft(make_move(board, move), next_turn, depth - 1, standard)
+
+
+def perft_divide(board, turn, depth, processes=1, standard=False):
+    """Count leaf nodes below each root move, optionally across a process pool"""
+    moves = generate_moves(board, turn, standard)
+    jobs = [(board, turn, move, depth, standard) for move in moves]
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            counts = list(executor.map(_perft_root_move, jobs))
+    else:
+        counts = [_perft_root_move(job) for job in jobs]
+    return list(zip(moves, counts))
+
+
+def format_move(move):
+    """Format a move as 'row,col-row,col'"""
+    (row, col), (end_row, end_col), skipped = move
+    separator = "x" if skipped else "-"
+    return f"{row},{col}{separator}{end_row},{end_col}"
+
+
+def verify(max_depth=None):
+    """Check the standard rules against the published counts and the game's rules against
+    the house-rule counts; return True if all match"""
+    ok = True
+    for title, counts, standard in (("standard rules (published counts)", REFERENCE_COUNTS, True),
+                                    ("house rules", HOUSE_RULE_COUNTS, False)):
+        print(title)
+        for depth, expected in sorted(counts.items()):
+            if max_depth is not None and depth > max_depth:
+                break
+            nodes = perft(Board(ENGLISH), RED, depth, standard)
+            status = "ok" if nodes == expected else "MISMATCH"
+            print(f"depth {depth}: {nodes:>8} (expected {expected}) {status}")
+            ok = ok and nodes == expected
+    return ok
+
+
+def random_playout(board, turn, max_plies=200):
+    """Play random moves the way the Monte Carlo rollouts do and return the number of plies"""
+    for ply in range(max_plies):
+        move = board.random_move(turn)
+        if move is None:
+            return ply
+        piece, (row, col), skipped = move
+        board.move(piece, row, col)
+        if skipped:
+            board.remove(skipped)
+        turn = WHITE if turn == RED else RED
+    return max_plies
+
+
+def benchmark(playouts=200):
+    """Print random-playout throughput per ply for every variant and for growing boards"""
+    # English rules on larger boards show the cost per ply does not grow with the board
+    geometries = list(VARIANTS.values()) + [Geometry("english", size, 3) for size in (10, 12, 16)]
+    for geometry in geometries:
+        name = geometry.name
+        start = time.perf_counter()
+        plies = sum(random_playout(Board(geometry), RED) for _ in range(playouts))
+        elapsed = time.perf_counter() - start
+        size = f"{geometry.rows}x{geometry.cols}"
+        print(f"{name:>13} {size}: {plies / elapsed:>10,.0f} plies/sec, {elapsed / plies * 1e6:6.1f} us/ply")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft verifier and benchmark for the checkers move generators")
+    parser.add_argument("depth", type=int, nargs="?", help="search depth in plies (default 6, or every "
+                                                              "reference depth with --verify)")
+    parser.add_argument("--divide", action="store_true", help="print counts per root move")
+    parser.add_argument("--processes", type=int, default=1, help="split root moves across this many processes")
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default=ENGLISH.name, help="board and rules")
+    parser.add_argument("--standard", action="store_true",
+                        help="standard rules: mandatory captures, multi-jumps played to the end")
+    parser.add_argument("--verify", action="store_true", help="check against the reference counts")
+    parser.add_argument("--bench", action="store_true", help="measure random-playout speed for every variant")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(0 if verify(args.depth) else 1)
+    if args.bench:
+        benchmark()
+        return
+
+    depth = 6 if args.depth is None else args.depth
+    board = Board(VARIANTS[args.variant])
+    if args.standard and board.geometry.flying_kings:
+        parser.error(f"--standard is not supported for the {args.variant} variant")
+    start = time.perf_counter()
+    if args.divide or args.processes > 1:
+        results = perft_divide(board, RED, depth, args.processes, args.standard)
+        if args.divide:
+            for move, count in results:
+                print(f"{format_move(move)}: {count}")
+        nodes = sum(count for _, count in results)
+    else:
+        nodes = perft(board, RED, depth, args.standard)
+    elapsed = time.perf_counter() - start
+
+    print(f"perft({depth}) = {nodes}")
+    print(f"{elapsed:.2f}s, {nodes / max(elapsed, 1e-9):,.0f} nodes/sec")
+
+
+if __name__ == "__main__":
+    main()